@@ -0,0 +1,42 @@
+# config/middleware.py
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger('config.queue_time')
+
+
+def parse_request_start(value):
+    """
+    Parse an X-Request-Start header into a UNIX timestamp in seconds.
+
+    Routers disagree on the format: Heroku sends milliseconds, nginx sends
+    `t=<seconds>.<millis>` and some proxies send `t=<microseconds>`.
+    """
+    try:
+        start = float(value.strip().removeprefix('t='))
+    except (AttributeError, ValueError):
+        return None
+    if start > 1e14:
+        return start / 1_000_000
+    if start > 1e11:
+        return start / 1_000
+    return start
+
+
+class RequestQueueTimeMiddleware:
+    """Log how long each request waited between the router and a free worker"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.warn_ms = settings.REQUEST_QUEUE_WARN_MS
+
+    def __call__(self, request):
+        start = parse_request_start(request.META.get('HTTP_X_REQUEST_START'))
+        if start is not None:
+            queue_ms = max(0.0, (time.time() - start) * 1000)
+            request.queue_time_ms = queue_ms
+            level = logging.WARNING if queue_ms >= self.warn_ms else logging.DEBUG
+            logger.log(level, "queue_time_ms=%.1f path=%s", queue_ms, request.path)
+        return self.get_response(request)
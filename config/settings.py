@@ -24,8 +24,14 @@ CSRF_TRUSTED_ORIGINS = config(
 # ------------------------------
 # APPLICATIONS
 # ------------------------------
+# Workers that only serve the public waitlist can set ADMIN_ENABLED=False to
+# leave django.contrib.admin out of INSTALLED_APPS and drop the /admin/
+# routes, so the admin package is never imported. When enabled,
+# SimpleAdminConfig defers autodiscover() to config/urls.py.
+# Run `migrate` with the admin enabled so its tables stay up to date.
+ADMIN_ENABLED = config('ADMIN_ENABLED', default=True, cast=bool)
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -33,8 +39,11 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'waitlist',
 ]
+if ADMIN_ENABLED:
+    INSTALLED_APPS.insert(0, 'django.contrib.admin.apps.SimpleAdminConfig')
 
 MIDDLEWARE = [
+    'config.middleware.RequestQueueTimeMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -69,22 +78,73 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # DATABASE
 # ------------------------------
 DATABASE_URL = os.environ.get('DATABASE_URL')
+
+# Pooled mode (Postgres only): each process keeps a bounded psycopg pool and
+# Django hands connections back to it at the end of every request, instead of
+# every worker thread holding its own persistent connection. Size the pool to
+# the threads a process runs plus headroom for the email threads.
+DATABASE_POOL = config('DATABASE_POOL', default=False, cast=bool)
+DATABASE_POOL_MIN_SIZE = config('DATABASE_POOL_MIN_SIZE', default=1, cast=int)
+DATABASE_POOL_MAX_SIZE = config(
+    'DATABASE_POOL_MAX_SIZE',
+    default=config('GUNICORN_THREADS', default=4, cast=int) + 2,
+    cast=int,
+)
+DATABASE_POOL_TIMEOUT = config('DATABASE_POOL_TIMEOUT', default=10, cast=float)
+
 if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
-            conn_health_checks=True,
+            # Pooling replaces persistent connections; Django rejects both
+            conn_max_age=0 if DATABASE_POOL else 600,
+            conn_health_checks=not DATABASE_POOL,
         )
     }
+    if DATABASE_POOL:
+        # Django adds psycopg_pool's connection check on checkout itself
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DATABASE_POOL_MIN_SIZE,
+            'max_size': DATABASE_POOL_MAX_SIZE,
+            # Seconds a request waits for a free connection before erroring
+            'timeout': DATABASE_POOL_TIMEOUT,
+        }
 else:
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 
+# Hardened SQLite for small single-box deployments: WAL lets readers (page
+# views, email threads) run alongside the writer, every transaction takes the
+# write lock up front (BEGIN IMMEDIATE) so two writers can't deadlock on a
+# lock upgrade, and busy connections wait instead of failing.
+SQLITE_HARDENED = config('SQLITE_HARDENED', default=True, cast=bool)
+SQLITE_BUSY_TIMEOUT = config('SQLITE_BUSY_TIMEOUT', default=20, cast=int)
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int)
+
+# Signup writes queue up behind one writer per process (waitlist/db.py). When
+# more than SQLITE_WRITE_QUEUE_SIZE requests are already waiting, or one has
+# waited SQLITE_WRITE_QUEUE_TIMEOUT seconds, the signup gets a 503 instead.
+SQLITE_WRITE_QUEUE_SIZE = config('SQLITE_WRITE_QUEUE_SIZE', default=64, cast=int)
+SQLITE_WRITE_QUEUE_TIMEOUT = config('SQLITE_WRITE_QUEUE_TIMEOUT', default=10, cast=float)
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3' and SQLITE_HARDENED:
+    DATABASES['default']['OPTIONS'] = {
+        'transaction_mode': 'IMMEDIATE',
+        # Seconds to wait on a locked database (sqlite's busy_timeout)
+        'timeout': SQLITE_BUSY_TIMEOUT,
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            f'PRAGMA mmap_size={SQLITE_MMAP_SIZE};'
+            'PRAGMA temp_store=MEMORY;'
+        ),
+    }
+
 # ------------------------------
 # PASSWORD VALIDATION
 # ------------------------------
@@ -109,7 +169,14 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static']
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -117,7 +184,7 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # ------------------------------
 # EMAIL (Brevo / SMTP)
 # ------------------------------
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = config('BREVO_SMTP_HOST', default='smtp-relay.brevo.com')
 EMAIL_PORT = config('BREVO_SMTP_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('BREVO_USE_TLS', default=True, cast=bool)
@@ -125,6 +192,43 @@ EMAIL_HOST_USER = config('BREVO_SMTP_USER', default='')
 EMAIL_HOST_PASSWORD = config('BREVO_SMTP_KEY', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@bodyforgr.com')
 
+# ------------------------------
+# SIGNUP VALIDATION
+# ------------------------------
+# Disposable domains (waitlist/data/disposable_domains.txt) are always
+# rejected. The MX lookup is opt-in; results are cached per process for
+# WAITLIST_MX_CACHE_TTL seconds. The default resolver needs `dnspython`.
+WAITLIST_MX_CHECK = config('WAITLIST_MX_CHECK', default=False, cast=bool)
+WAITLIST_MX_RESOLVER = config('WAITLIST_MX_RESOLVER', default='waitlist.validators.DNSPythonResolver')
+WAITLIST_MX_CACHE_TTL = config('WAITLIST_MX_CACHE_TTL', default=3600, cast=int)
+WAITLIST_MX_TIMEOUT = config('WAITLIST_MX_TIMEOUT', default=2.0, cast=float)
+
+# ------------------------------
+# DATA RETENTION (purge_waitlist command)
+# ------------------------------
+# Waitlist rows older than this many days are archived; 0 keeps them forever.
+WAITLIST_ARCHIVE_AFTER_DAYS = config('WAITLIST_ARCHIVE_AFTER_DAYS', default=0, cast=int)
+# Signup IP addresses are cleared after this many days.
+WAITLIST_IP_RETENTION_DAYS = config('WAITLIST_IP_RETENTION_DAYS', default=30, cast=int)
+
+# ------------------------------
+# LOGGING
+# ------------------------------
+# Requests that waited longer than this for a worker are logged as warnings
+REQUEST_QUEUE_WARN_MS = config('REQUEST_QUEUE_WARN_MS', default=500, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'config': {'handlers': ['console'], 'level': config('LOG_LEVEL', default='INFO')},
+        'waitlist': {'handlers': ['console'], 'level': config('LOG_LEVEL', default='INFO')},
+    },
+}
+
 # ------------------------------
 # SECURITY FOR PRODUCTION
 # ------------------------------
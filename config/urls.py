@@ -1,16 +1,21 @@
 # bodyforgr/urls.py
-from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('waitlist/', include('waitlist.urls')),  # This includes your waitlist app
     path('', RedirectView.as_view(url='/waitlist/', permanent=False)),  # Redirect root to waitlist
 ]
 
+# Admin is only wired up (and its modules discovered) on workers that serve it
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    admin.autodiscover()
+    urlpatterns += [path('admin/', admin.site.urls)]
+
 # Serve static files in development
 if settings.DEBUG:
     # urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
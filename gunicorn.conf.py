@@ -0,0 +1,107 @@
+# gunicorn.conf.py - picked up automatically by `gunicorn` from the project root
+import gc
+import math
+import os
+
+from decouple import config as env  # `config` is itself a gunicorn setting
+
+
+def cpu_count():
+    """CPUs this process may use: its affinity mask, capped by a cgroup v2 CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # Affinity ignores CPU quotas, so a container limited to 1 CPU on a
+    # 64-core host would otherwise size itself for 64
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+# ------------------------------
+# SERVER SOCKET
+# ------------------------------
+bind = f"0.0.0.0:{env('PORT', default=8000, cast=int)}"
+
+# ------------------------------
+# WORKERS
+# ------------------------------
+# gthread (default): each worker process serves GUNICORN_THREADS requests at
+# once, so SMTP and database waits no longer block the whole worker.
+# uvicorn: serves config.asgi instead; requires the `uvicorn` package.
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+worker_type = env('GUNICORN_WORKER_CLASS', default='gthread')
+worker_class = WORKER_CLASSES.get(worker_type, worker_type)
+wsgi_app = 'config.asgi:application' if worker_type == 'uvicorn' else 'config.wsgi:application'
+
+# Without DATABASE_URL we run on SQLite, which has one writer per database:
+# a single process lets the in-process write queue (waitlist/db.py) order
+# signups instead of separate processes contending on the file lock.
+# The cap keeps a big host from opening more Postgres connections than the
+# database allows (workers x DATABASE_POOL_MAX_SIZE per instance).
+MAX_DEFAULT_WORKERS = 9
+default_workers = min(cpu_count() * 2 + 1, MAX_DEFAULT_WORKERS) if env('DATABASE_URL', default='') else 1
+workers = env('WEB_CONCURRENCY', default=default_workers, cast=int)
+# gunicorn turns `sync` into gthread whenever threads > 1, so only gthread
+# gets a thread pool by default
+threads = env('GUNICORN_THREADS', default=4 if worker_type == 'gthread' else 1, cast=int)
+
+# ------------------------------
+# CONNECTIONS & RECYCLING
+# ------------------------------
+# Keep client connections open between requests from the platform's proxy
+keepalive = env('GUNICORN_KEEPALIVE', default=5, cast=int)
+timeout = env('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = env('GUNICORN_GRACEFUL_TIMEOUT', default=30, cast=int)
+
+# Recycle workers to cap slow memory growth; the jitter keeps them from all
+# restarting at the same moment.
+max_requests = env('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+
+# ------------------------------
+# LOGGING
+# ------------------------------
+accesslog = env('GUNICORN_ACCESS_LOG', default='-')
+# %(D)s is the time spent in the app (microseconds); X-Request-Start is the
+# timestamp the platform router stamped when the request arrived.
+access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(D)sus start=%({x-request-start}i)s'
+
+# ------------------------------
+# PRELOAD
+# ------------------------------
+# With GUNICORN_PRELOAD=True the app is imported once in the master and
+# forked into workers, so new workers start serving immediately.
+preload_app = env('GUNICORN_PRELOAD', default=False, cast=bool)
+
+
+def when_ready(server):
+    server.log.info(
+        "Serving %s with %d %s worker(s) x %d thread(s)",
+        wsgi_app, workers, worker_class, threads,
+    )
+    if not preload_app:
+        return
+
+    # Import the URLconf (and the views behind it) before forking so every
+    # worker inherits it instead of paying for it on its first request.
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+
+    # Move everything loaded so far out of the GC's reach. Otherwise the first
+    # collection in each worker touches every object header and copy-on-write
+    # duplicates the master's memory page by page.
+    gc.collect()
+    gc.freeze()
+    server.log.info("Preloaded app; froze %d objects for copy-on-write", gc.get_freeze_count())
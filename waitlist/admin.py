@@ -10,9 +10,18 @@
     
 # admin.site.register(WaitListUser, WaitListUserAdmin)
 
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
+from .bulk import chunked_update
+from .emails import send_confirmation_emails
 from .models import WaitListUser
 
+# Largest selection the admin will email from inside a web request. Bigger
+# cohorts go through `manage.py waitlist_bulk resend`, which isn't subject to
+# the worker timeout or recycling.
+ADMIN_RESEND_LIMIT = 200
+
+
 @admin.register(WaitListUser)
 class WaitListUserAdmin(admin.ModelAdmin):
     list_display = (
@@ -29,6 +38,7 @@ class WaitListUserAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
 
     readonly_fields = ("created_at",)
+    actions = ("invite_users", "promote_early_adopters", "resend_confirmations")
 
     fieldsets = (
         ("User Info", {
@@ -41,3 +51,33 @@ class WaitListUserAdmin(admin.ModelAdmin):
             "fields": ("created_at",),
         }),
     )
+
+    # Bulk actions run as chunked QuerySet.update() calls rather than saving
+    # each row, so even "select all" over a huge list stays fast.
+
+    @admin.action(description="Invite selected users")
+    def invite_users(self, request, queryset):
+        updated = chunked_update(queryset.filter(is_invited=False), is_invited=True, updated_at=timezone.now())
+        self.message_user(request, f"Invited {updated} user(s).", messages.SUCCESS)
+
+    @admin.action(description="Mark selected users as early adopters")
+    def promote_early_adopters(self, request, queryset):
+        updated = chunked_update(
+            queryset.filter(is_early_adopter=False), is_early_adopter=True, updated_at=timezone.now()
+        )
+        self.message_user(request, f"Promoted {updated} user(s) to early adopter.", messages.SUCCESS)
+
+    @admin.action(description="Re-send confirmation email to selected users")
+    def resend_confirmations(self, request, queryset):
+        count = queryset.count()
+        if count > ADMIN_RESEND_LIMIT:
+            self.message_user(
+                request,
+                f"{count} users selected; the admin can email at most {ADMIN_RESEND_LIMIT} at once. "
+                f"Use `python manage.py waitlist_bulk resend` with filters for larger cohorts.",
+                messages.ERROR,
+            )
+            return
+        sent = send_confirmation_emails(queryset)
+        level = messages.SUCCESS if sent == count else messages.WARNING
+        self.message_user(request, f"Sent confirmation emails to {sent} of {count} user(s).", level)
@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class WaitlistConfig(AppConfig):
     name = 'waitlist'
+
+    def ready(self):
+        if settings.WAITLIST_MX_CHECK:
+            # Build the MX resolver at startup so a missing dependency or bad
+            # WAITLIST_MX_RESOLVER stops the worker from booting, instead of
+            # failing every signup at form validation.
+            from .validators import get_mx_checker
+            get_mx_checker()
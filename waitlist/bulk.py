@@ -0,0 +1,62 @@
+from django.db import transaction
+
+from .db import single_writer
+
+# Rows touched per UPDATE/SELECT when acting on a large selection. Each chunk
+# is its own short transaction, so signups can still get in between chunks.
+BULK_CHUNK_SIZE = 1000
+
+
+def iter_chunks(queryset, chunk_size=BULK_CHUNK_SIZE):
+    """Yield lists of up to chunk_size objects from queryset, in primary-key order"""
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        objects = list(page[:chunk_size])
+        if not objects:
+            return
+        yield objects
+        last_pk = objects[-1].pk
+
+
+def chunked_update(queryset, chunk_size=BULK_CHUNK_SIZE, **values):
+    """
+    Apply values to every row in queryset and return the number of rows updated.
+
+    Runs one `UPDATE ... WHERE <filter> AND pk BETWEEN ...` per chunk_size rows
+    instead of saving each object, so model save() hooks, signals and auto_now
+    fields are skipped; pass those values explicitly.
+    """
+    queryset = queryset.order_by('pk')
+    updated = 0
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        # Only fetch the pk closing this chunk, not the whole chunk
+        upper_pk = page.values_list('pk', flat=True)[chunk_size - 1:chunk_size].first()
+
+        chunk = page if upper_pk is None else page.filter(pk__lte=upper_pk)
+        with single_writer(), transaction.atomic():
+            updated += chunk.update(**values)
+
+        if upper_pk is None:
+            return updated
+        last_pk = upper_pk
+
+
+def chunked_delete(queryset, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Delete every row in queryset, chunk_size rows per DELETE, and return the
+    number of rows deleted. Keeps each transaction (and its locks) short.
+    """
+    model = queryset.model
+    queryset = queryset.order_by('pk')
+    deleted = 0
+    while True:
+        with single_writer(), transaction.atomic():
+            pks = list(queryset.values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                return deleted
+            count, _ = model._base_manager.filter(pk__in=pks).delete()
+            deleted += count
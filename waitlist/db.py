@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+
+class WriteQueueFull(Exception):
+    """Too many signups are already waiting to write"""
+
+
+_write_lock = threading.Lock()
+_state_lock = threading.Lock()
+_waiting = 0
+# How many single_writer() blocks the current thread is inside
+_held = threading.local()
+
+
+@contextmanager
+def single_writer(using='default'):
+    """
+    Serialize writes to SQLite within this process.
+
+    SQLite allows one writer at a time. Without this, concurrent request
+    threads all spin in SQLite's busy handler and the unlucky ones time out
+    with "database is locked". Here they wait in line on a lock instead, and
+    once the line is full (or too slow) new writers are turned away with
+    WriteQueueFull so the caller can answer 503. Nested calls in the thread
+    that already holds the lock pass straight through, as do other databases.
+    """
+    if connections[using].vendor != 'sqlite':
+        yield
+        return
+
+    depth = getattr(_held, 'depth', 0)
+    if depth:
+        _held.depth = depth + 1
+        try:
+            yield
+        finally:
+            _held.depth = depth
+        return
+
+    global _waiting
+    with _state_lock:
+        if _waiting >= settings.SQLITE_WRITE_QUEUE_SIZE:
+            raise WriteQueueFull()
+        _waiting += 1
+    try:
+        acquired = _write_lock.acquire(timeout=settings.SQLITE_WRITE_QUEUE_TIMEOUT)
+    finally:
+        with _state_lock:
+            _waiting -= 1
+    if not acquired:
+        raise WriteQueueFull()
+
+    _held.depth = 1
+    try:
+        yield
+    finally:
+        _held.depth = 0
+        _write_lock.release()
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+import logging
+
+from .bulk import iter_chunks
+from .models import WaitListUser
+
+logger = logging.getLogger(__name__)
+
+# Emails sent per SMTP connection when mailing many users at once
+EMAIL_BATCH_SIZE = 100
+
+
+def build_confirmation_email(waitlist_user, position=None, is_new_user=True, total_users=None, connection=None):
+    """Render the waitlist confirmation email for one user"""
+    context = {
+        'user': waitlist_user,
+        'position': position if is_new_user else None,
+        'is_early_adopter': waitlist_user.is_early_adopter,
+        'total_users': WaitListUser.count_signups() if total_users is None else total_users,
+        'unsubscribe_link': '#',
+        'privacy_link': '#',
+    }
+
+    html_content = render_to_string(
+        "emails/waitlist_confirmation.html",
+        context
+    )
+    message = EmailMultiAlternatives(
+        subject="Welcome to BodyForgr Waitlist!",
+        body=strip_tags(html_content),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[waitlist_user.email],
+        connection=connection,
+    )
+    message.attach_alternative(html_content, "text/html")
+    return message
+
+
+def send_confirmation_email(waitlist_user, position=None, is_new_user=True, total_users=None):
+    """Send waitlist confirmation email"""
+    try:
+        build_confirmation_email(waitlist_user, position, is_new_user, total_users).send(fail_silently=False)
+
+        logger.info(f"Confirmation email sent to {waitlist_user.email}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to send email to {waitlist_user.email}: {str(e)}")
+        return False
+
+
+def send_confirmation_emails(queryset, batch_size=EMAIL_BATCH_SIZE):
+    """
+    Re-send confirmation emails to everyone in queryset.
+
+    Users are fetched in primary-key chunks and each chunk goes out over a
+    single SMTP connection, rather than one connection per email.
+    Returns the number of emails sent.
+    """
+    total_users = WaitListUser.count_signups()
+    sent = 0
+    for users in iter_chunks(queryset, batch_size):
+        try:
+            with get_connection(fail_silently=False) as connection:
+                messages = [
+                    build_confirmation_email(user, is_new_user=False, total_users=total_users, connection=connection)
+                    for user in users
+                ]
+                sent += connection.send_messages(messages) or 0
+        except Exception as e:
+            logger.error(f"Failed to send confirmation batch of {len(users)} ending at id {users[-1].pk}: {str(e)}")
+
+    logger.info(f"Re-sent {sent} confirmation emails")
+    return sent
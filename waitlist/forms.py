@@ -1,6 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from .models import WaitListUser, RoleChoices, SourceChoices
+from .validators import validate_signup_email
 
 class WaitlistSignupForm(forms.ModelForm):
     # Removed confirm_email field since you're not using it in template
@@ -46,6 +47,7 @@ class WaitlistSignupForm(forms.ModelForm):
         email = self.cleaned_data.get('email')
         if email:
             email = email.lower()
+            validate_signup_email(email)
             # Check if email already exists
             if WaitListUser.objects.filter(email=email).exists():
                 # We'll handle duplicates in the view
@@ -0,0 +1,88 @@
+import http.client
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Load-test a running server over HTTP and report throughput and latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/waitlist/',
+                            help="Page to request (default: http://127.0.0.1:8000/waitlist/)")
+        parser.add_argument('--signup', action='store_true',
+                            help="POST a unique signup to <host>/waitlist/signup/ instead of GETting --url")
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help="Concurrent keep-alive clients (default: 8)")
+        parser.add_argument('--duration', type=float, default=10.0,
+                            help="Seconds to run for (default: 10)")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http':
+            raise CommandError("Only plain http:// URLs are supported.")
+
+        deadline = time.perf_counter() + options['duration']
+        latencies = []
+        statuses = Counter()
+        lock = threading.Lock()
+
+        def client():
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+            local_latencies, local_statuses = [], Counter()
+            while time.perf_counter() < deadline:
+                method, path, body, headers = self.build_request(url, options['signup'])
+                started = time.perf_counter()
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    local_statuses[response.status] += 1
+                except (OSError, http.client.HTTPException) as e:
+                    local_statuses[type(e).__name__] += 1
+                    conn.close()
+                    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+                local_latencies.append(time.perf_counter() - started)
+            conn.close()
+            with lock:
+                latencies.extend(local_latencies)
+                statuses.update(local_statuses)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if not latencies:
+            raise CommandError("No requests completed.")
+
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(f"Requests:    {len(latencies)} in {elapsed:.1f}s "
+                          f"with {options['concurrency']} clients")
+        self.stdout.write(self.style.SUCCESS(f"Throughput:  {len(latencies) / elapsed:.1f} req/s"))
+        self.stdout.write(f"Latency ms:  p50={percentile(0.50):.1f} p95={percentile(0.95):.1f} "
+                          f"p99={percentile(0.99):.1f} mean={statistics.mean(latencies) * 1000:.1f}")
+        self.stdout.write("Responses:   " + ", ".join(f"{k}={v}" for k, v in sorted(statuses.items(), key=str)))
+
+    def build_request(self, url, signup):
+        if not signup:
+            return 'GET', url.path or '/', None, {}
+        body = urlencode({
+            'name': 'Bench User',
+            'email': f"bench-{uuid.uuid4().hex}@example.com",
+            'role': 'user',
+            'source': 'other',
+        })
+        return 'POST', '/waitlist/signup/', body, {'Content-Type': 'application/x-www-form-urlencoded'}
@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: import the WSGI module, then serve one request.
+PROBE = """
+import json, sys, time
+from importlib import import_module
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+module = import_module(sys.argv[1])
+booted = time.perf_counter()
+
+environ = {'PATH_INFO': sys.argv[2]}
+setup_testing_defaults(environ)
+status = []
+response = module.application(environ, lambda s, headers, exc_info=None: status.append(s))
+b''.join(response)
+if hasattr(response, 'close'):
+    response.close()
+responded = time.perf_counter()
+
+print(json.dumps({
+    'status': status[0] if status else None,
+    'import_ms': (booted - started) * 1000,
+    'request_ms': (responded - booted) * 1000,
+    'responded_at': time.time(),
+}))
+"""
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+class Command(BaseCommand):
+    help = "Profile a cold start: per-module import time and boot-to-first-response time."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='config.wsgi',
+                            help="Module exposing the WSGI `application` (default: config.wsgi)")
+        parser.add_argument('--path', default='/waitlist/',
+                            help="Path requested as the first response (default: /waitlist/)")
+        parser.add_argument('--top', type=int, default=20,
+                            help="Number of slowest modules to list (default: 20)")
+        parser.add_argument('--repeat', type=int, default=3,
+                            help="Cold starts to run; timings are reported as the median (default: 3)")
+
+    def handle(self, *args, **options):
+        runs = [self.cold_start(options['module'], options['path']) for _ in range(max(1, options['repeat']))]
+        result, imports = runs[-1]
+
+        self.stdout.write(f"Slowest imports (last run, {len(imports)} modules):")
+        self.stdout.write(f"{'self ms':>9} {'cumul ms':>9}  module")
+        for self_us, cumulative_us, name in sorted(imports, key=lambda i: i[0], reverse=True)[:options['top']]:
+            self.stdout.write(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+
+        def median(key):
+            return statistics.median(run[key] for run, _ in runs)
+
+        self.stdout.write("")
+        self.stdout.write(f"First response:       {result['status']} for {options['path']}")
+        self.stdout.write(f"Import {options['module']}: {median('import_ms'):.1f} ms")
+        self.stdout.write(f"First request:        {median('request_ms'):.1f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"Boot to first response: {median('boot_to_response_ms'):.1f} ms "
+            f"(median of {len(runs)})"
+        ))
+
+    def cold_start(self, module, path):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        spawned_at = time.time()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE, module, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Cold start failed:\n{proc.stderr[-2000:]}")
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result['boot_to_response_ms'] = (result['responded_at'] - spawned_at) * 1000
+
+        imports = []
+        for line in proc.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                imports.append((int(match.group(1)), int(match.group(2)), match.group(4)))
+        return result, imports
@@ -0,0 +1,174 @@
+import gzip
+import json
+import os
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from waitlist.bulk import BULK_CHUNK_SIZE, chunked_delete, chunked_update
+from waitlist.db import single_writer
+from waitlist.models import ArchivedSignupCount, ArchivedWaitListUser, WaitListUser
+
+
+def table_size(model):
+    """On-disk bytes of a model's table and its indexes, or None if unknown"""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat "
+                    "WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = %s)",
+                    [table],
+                )
+            except DatabaseError:
+                # SQLite built without the dbstat virtual table
+                return None
+        else:
+            return None
+        return cursor.fetchone()[0]
+
+
+def format_size(size):
+    if size is None:
+        return "n/a"
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the waitlist data retention policy in small batches: archive old "
+        "waitlist rows, clear old signup IP addresses and delete expired sessions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archive-after', type=int, default=settings.WAITLIST_ARCHIVE_AFTER_DAYS, metavar='DAYS',
+                            help="Archive waitlist rows older than DAYS; 0 disables "
+                                 f"(default: WAITLIST_ARCHIVE_AFTER_DAYS={settings.WAITLIST_ARCHIVE_AFTER_DAYS})")
+        parser.add_argument('--archive-file', metavar='PATH',
+                            help="Append archived rows to this gzipped JSONL file instead of the archive table")
+        parser.add_argument('--ip-retention', type=int, default=settings.WAITLIST_IP_RETENTION_DAYS, metavar='DAYS',
+                            help="Clear signup IPs older than DAYS; 0 disables "
+                                 f"(default: WAITLIST_IP_RETENTION_DAYS={settings.WAITLIST_IP_RETENTION_DAYS})")
+        parser.add_argument('--batch-size', type=int, default=BULK_CHUNK_SIZE,
+                            help=f"Rows per statement (default: {BULK_CHUNK_SIZE})")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many rows each step would touch")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        now = timezone.now()
+        to_archive = WaitListUser.objects.none()
+        if options['archive_after'] > 0:
+            to_archive = WaitListUser.objects.filter(created_at__lt=now - timedelta(days=options['archive_after']))
+        to_scrub = WaitListUser.objects.none()
+        if options['ip_retention'] > 0:
+            to_scrub = WaitListUser.objects.filter(
+                created_at__lt=now - timedelta(days=options['ip_retention']),
+                ip_address__isnull=False,
+            )
+        expired_sessions = Session.objects.filter(expire_date__lt=now)
+
+        if options['dry_run']:
+            self.stdout.write(f"Would archive {to_archive.count()} waitlist row(s)")
+            self.stdout.write(f"Would clear {to_scrub.count()} IP address(es)")
+            self.stdout.write(f"Would delete {expired_sessions.count()} expired session(s)")
+            return
+
+        tables = [WaitListUser, ArchivedWaitListUser, Session]
+        sizes_before = {model: table_size(model) for model in tables}
+
+        batch_size = options['batch_size']
+        self.run_step("Archived waitlist rows", lambda: self.archive(to_archive, batch_size, options['archive_file']))
+        # Archived rows are gone, so this only touches rows we keep
+        self.run_step("Cleared IP addresses", lambda: chunked_update(to_scrub, batch_size, ip_address=None, updated_at=now))
+        self.run_step("Deleted expired sessions", lambda: chunked_delete(expired_sessions, batch_size))
+
+        for model in tables:
+            self.stdout.write(
+                f"{model._meta.db_table}: {format_size(sizes_before[model])} -> {format_size(table_size(model))}"
+            )
+
+    def run_step(self, label, step):
+        started = time.perf_counter()
+        rows = step()
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(f"{label}: {rows} in {elapsed:.2f}s ({rate:.0f} rows/s)"))
+
+    def archive(self, queryset, batch_size, archive_file):
+        """
+        Move rows out batch by batch. Each batch is copied, added to the
+        archived signup counts and deleted in one transaction.
+        """
+        queryset = queryset.order_by('pk')
+        archive = None
+        archived = 0
+        try:
+            while True:
+                with single_writer(), transaction.atomic():
+                    rows = list(queryset[:batch_size])
+                    if not rows:
+                        return archived
+                    if archive_file:
+                        if archive is None:
+                            archive = self.open_archive(archive_file)
+                        # Written before the DELETE commits: a failed batch may
+                        # leave duplicates in the file but never loses a row.
+                        archive.writelines(json.dumps(self.serialize(row)) + '\n' for row in rows)
+                        archive.flush()
+                    else:
+                        ArchivedWaitListUser.objects.bulk_create([
+                            ArchivedWaitListUser(
+                                original_id=row.pk,
+                                name=row.name,
+                                email=row.email,
+                                role=row.role,
+                                source=row.source,
+                                is_early_adopter=row.is_early_adopter,
+                                is_invited=row.is_invited,
+                                created_at=row.created_at,
+                            )
+                            for row in rows
+                        ])
+                    # Either way the rows keep counting towards totals and positions
+                    ArchivedSignupCount.add(rows)
+                    WaitListUser.objects.filter(pk__in=[row.pk for row in rows]).delete()
+                archived += len(rows)
+        finally:
+            if archive is not None:
+                archive.close()
+
+    def open_archive(self, path):
+        """Open the JSONL archive for appending, creating its directory if needed"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            return gzip.open(path, 'at', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f"Can't open archive file {path}: {e}")
+
+    def serialize(self, row):
+        return {
+            'id': row.pk,
+            'name': row.name,
+            'email': row.email,
+            'role': row.role,
+            'source': row.source,
+            'is_early_adopter': row.is_early_adopter,
+            'is_invited': row.is_invited,
+            'created_at': row.created_at.isoformat(),
+            'archived_at': timezone.now().isoformat(),
+        }
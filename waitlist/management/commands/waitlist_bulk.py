@@ -0,0 +1,73 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from waitlist.bulk import BULK_CHUNK_SIZE, chunked_update
+from waitlist.models import RoleChoices, SourceChoices, WaitListUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply a bulk action to waitlist users matching the given filters: "
+        "invite them, mark them as early adopters, or re-send their confirmation email. "
+        "Same as the admin actions, for selections too large for the browser."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['invite', 'promote', 'resend'])
+        parser.add_argument('--role', choices=RoleChoices.values)
+        parser.add_argument('--source', choices=SourceChoices.values)
+        parser.add_argument('--joined-after', type=date.fromisoformat, metavar='YYYY-MM-DD')
+        parser.add_argument('--joined-before', type=date.fromisoformat, metavar='YYYY-MM-DD')
+        parser.add_argument('--invited', choices=['yes', 'no'],
+                            help="Only users who have (yes) or have not (no) been invited")
+        parser.add_argument('--chunk-size', type=int, default=BULK_CHUNK_SIZE,
+                            help=f"Rows per UPDATE or email batch (default: {BULK_CHUNK_SIZE})")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many users match")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        queryset = self.filter_users(options)
+        action = options['action']
+        if action == 'invite':
+            queryset = queryset.filter(is_invited=False)
+        elif action == 'promote':
+            queryset = queryset.filter(is_early_adopter=False)
+
+        matched = queryset.count()
+        if options['dry_run']:
+            self.stdout.write(f"{matched} user(s) would be affected by '{action}'.")
+            return
+
+        started = time.perf_counter()
+        if action == 'invite':
+            done = chunked_update(queryset, options['chunk_size'], is_invited=True, updated_at=timezone.now())
+        elif action == 'promote':
+            done = chunked_update(queryset, options['chunk_size'], is_early_adopter=True, updated_at=timezone.now())
+        else:
+            from waitlist.emails import send_confirmation_emails
+            done = send_confirmation_emails(queryset, options['chunk_size'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{action}: {done} of {matched} user(s) in {elapsed:.1f}s"
+        ))
+
+    def filter_users(self, options):
+        queryset = WaitListUser.objects.all()
+        if options['role']:
+            queryset = queryset.filter(role=options['role'])
+        if options['source']:
+            queryset = queryset.filter(source=options['source'])
+        if options['joined_after']:
+            queryset = queryset.filter(created_at__date__gte=options['joined_after'])
+        if options['joined_before']:
+            queryset = queryset.filter(created_at__date__lt=options['joined_before'])
+        if options['invited']:
+            queryset = queryset.filter(is_invited=options['invited'] == 'yes')
+        return queryset
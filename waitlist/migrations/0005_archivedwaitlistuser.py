@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waitlist', '0004_alter_waitlistuser_role_alter_waitlistuser_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedWaitListUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField()),
+                ('name', models.CharField(max_length=255)),
+                ('email', models.EmailField(max_length=254)),
+                ('role', models.CharField(choices=[('user', 'Fitness Enthusiast'), ('coach', 'Fitness Coach/Trainer')], max_length=10)),
+                ('source', models.CharField(blank=True, choices=[('homepage', 'Homepage'), ('x', 'X (formerly Twitter)'), ('social', 'Social Media'), ('search', 'Search Engine'), ('friend', 'Friend/Colleague'), ('other', 'Other')], max_length=50, null=True)),
+                ('is_early_adopter', models.BooleanField(default=False)),
+                ('is_invited', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Waitlist User',
+                'verbose_name_plural': 'Archived Waitlist Users',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:55
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_archived_rows(apps, schema_editor):
+    ArchivedWaitListUser = apps.get_model('waitlist', 'ArchivedWaitListUser')
+    ArchivedSignupCount = apps.get_model('waitlist', 'ArchivedSignupCount')
+    ArchivedSignupCount.objects.bulk_create([
+        ArchivedSignupCount(role=row['role'], is_early_adopter=row['is_early_adopter'], count=row['count'])
+        for row in ArchivedWaitListUser.objects.values('role', 'is_early_adopter').annotate(count=Count('pk'))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('waitlist', '0005_archivedwaitlistuser'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSignupCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('user', 'Fitness Enthusiast'), ('coach', 'Fitness Coach/Trainer')], max_length=10)),
+                ('is_early_adopter', models.BooleanField(default=False)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('role', 'is_early_adopter'), name='unique_archived_signup_count')],
+            },
+        ),
+        migrations.RunPython(count_archived_rows, migrations.RunPython.noop),
+    ]
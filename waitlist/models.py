@@ -1,4 +1,7 @@
+from collections import Counter
+
 from django.db import models
+from django.db.models import Count, F, Q, Sum
 
 class RoleChoices(models.TextChoices):
     USER = 'user', 'Fitness Enthusiast'
@@ -35,14 +38,92 @@ class WaitListUser(models.Model):
         self.email = self.email.lower()
         super().save(*args, **kwargs)
     
+    @staticmethod
+    def count_signups(**filters):
+        """
+        Count signups matching role/is_early_adopter filters, including rows
+        archived by purge_waitlist (read from their running totals, not rescanned).
+        """
+        return WaitListUser.objects.filter(**filters).count() + ArchivedSignupCount.total(**filters)
+
+    @staticmethod
+    def signup_stats():
+        """Total, coach and early-adopter signup counts for the public pages"""
+        stats = WaitListUser.objects.aggregate(
+            total_users=Count('pk'),
+            coaches=Count('pk', filter=Q(role=RoleChoices.COACH)),
+            early_birds=Count('pk', filter=Q(is_early_adopter=True)),
+        )
+        for archived in ArchivedSignupCount.objects.all():
+            stats['total_users'] += archived.count
+            if archived.role == RoleChoices.COACH:
+                stats['coaches'] += archived.count
+            if archived.is_early_adopter:
+                stats['early_birds'] += archived.count
+        return stats
+
     @property
     def waitlist_position(self):
         """Calculate position in waitlist"""
-        return WaitListUser.objects.filter(
-            created_at__lt=self.created_at
-        ).count() + 1
+        # purge_waitlist archives the oldest rows, so every archived signup is
+        # ahead of every row still in the table
+        earlier = WaitListUser.objects.filter(created_at__lt=self.created_at).count()
+        return earlier + ArchivedSignupCount.total() + 1
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Waitlist User'
-        verbose_name_plural = 'Waitlist Users'
\ No newline at end of file
+        verbose_name_plural = 'Waitlist Users'
+
+class ArchivedWaitListUser(models.Model):
+    """Compact copy of a waitlist row moved out by the purge_waitlist command"""
+    original_id = models.BigIntegerField()
+    name = models.CharField(max_length=255)
+    email = models.EmailField()
+    role = models.CharField(max_length=10, choices=RoleChoices.choices)
+    source = models.CharField(max_length=50, choices=SourceChoices.choices, blank=True, null=True)
+    is_early_adopter = models.BooleanField(default=False)
+    is_invited = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.email}) - archived"
+
+    class Meta:
+        verbose_name = 'Archived Waitlist User'
+        verbose_name_plural = 'Archived Waitlist Users'
+
+
+class ArchivedSignupCount(models.Model):
+    """
+    How many waitlist rows purge_waitlist has archived, per role and
+    early-adopter status. Kept in step with each archive batch so counts never
+    have to scan the archive table (or the archive file, which can't be).
+    """
+    role = models.CharField(max_length=10, choices=RoleChoices.choices)
+    is_early_adopter = models.BooleanField(default=False)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.role} (early adopter: {self.is_early_adopter}): {self.count}"
+
+    @staticmethod
+    def total(**filters):
+        return ArchivedSignupCount.objects.filter(**filters).aggregate(total=Sum('count'))['total'] or 0
+
+    @staticmethod
+    def add(rows):
+        """Add archived WaitListUser rows to the totals; call inside the archiving transaction"""
+        for (role, is_early_adopter), count in Counter((row.role, row.is_early_adopter) for row in rows).items():
+            updated = ArchivedSignupCount.objects.filter(role=role, is_early_adopter=is_early_adopter).update(
+                count=F('count') + count
+            )
+            if not updated:
+                ArchivedSignupCount.objects.create(role=role, is_early_adopter=is_early_adopter, count=count)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['role', 'is_early_adopter'], name='unique_archived_signup_count'),
+        ]
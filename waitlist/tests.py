@@ -1,3 +1,334 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.contrib.sessions.models import Session
+from django.db import connection, connections
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db.backends.signals import connection_created
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from config.middleware import parse_request_start
+from .bulk import chunked_update
+from .db import WriteQueueFull, single_writer
+from .forms import WaitlistSignupForm
+from .models import ArchivedSignupCount, ArchivedWaitListUser, WaitListUser
+from .validators import MXResolver, validate_signup_email, validation_stats
+
+
+class RequestQueueTimeTests(TestCase):
+    def test_parses_router_timestamp_formats(self):
+        self.assertEqual(parse_request_start('1700000000123'), 1700000000.123)
+        self.assertEqual(parse_request_start('t=1700000000.123'), 1700000000.123)
+        self.assertEqual(parse_request_start('t=1700000000123456'), 1700000000.123456)
+        self.assertIsNone(parse_request_start(None))
+        self.assertIsNone(parse_request_start('garbage'))
+
+    def test_logs_queue_time(self):
+        with self.assertLogs('config.queue_time', level='DEBUG') as logs:
+            self.client.get('/', HTTP_X_REQUEST_START='t=1700000000.000')
+        self.assertTrue(logs.output[0].endswith('path=/'))
+        self.assertTrue(logs.output[0].startswith('WARNING'))
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ConnectionLeakTests(TransactionTestCase):
+    def test_concurrent_signups_close_thread_connections(self):
+        wrapper_class = type(connections['default'])
+        opened, closed = {}, set()
+        close = wrapper_class.close
+
+        def record_open(sender, connection, **kwargs):
+            opened[id(connection)] = threading.current_thread().name
+
+        def record_close(wrapper):
+            closed.add(id(wrapper))
+            return close(wrapper)
+
+        def signup(i):
+            try:
+                return Client().post('/waitlist/signup/', {
+                    'name': f'User {i}',
+                    'email': f'user{i}@example.com',
+                    'role': 'user',
+                    'source': 'other',
+                })
+            finally:
+                # What request_finished does for a real request
+                connection.close()
+
+        connection_created.connect(record_open)
+        try:
+            with mock.patch.object(wrapper_class, 'close', autospec=True, side_effect=record_close):
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    statuses = [response.status_code for response in pool.map(signup, range(8))]
+                for thread in threading.enumerate():
+                    if thread.name == 'waitlist-email':
+                        thread.join()
+        finally:
+            connection_created.disconnect(record_open)
+
+        # Every signup committed (no "database is locked") and sent its email
+        # without the email thread touching the database
+        self.assertEqual(statuses, [200] * 8)
+        self.assertEqual(WaitListUser.objects.count(), 8)
+        self.assertEqual(len(mail.outbox), 8)
+        self.assertNotIn('waitlist-email', opened.values())
+        self.assertTrue(any('out of 8' in message.body for message in mail.outbox))
+        leaked = [name for key, name in opened.items() if key not in closed]
+        self.assertEqual(leaked, [])
+
+
+class DbPoolStatsTests(TestCase):
+    def test_requires_staff(self):
+        response = self.client.get('/waitlist/health/db/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_reports_unpooled_connection(self):
+        staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        data = self.client.get('/waitlist/health/db/').json()
+        self.assertEqual(data['vendor'], 'sqlite')
+        self.assertFalse(data['pooled'])
+        self.assertEqual(data['stats'], {})
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class BulkActionTests(TestCase):
+    def setUp(self):
+        WaitListUser.objects.bulk_create([
+            WaitListUser(name=f'User {i}', email=f'user{i}@example.com', role='coach' if i % 2 else 'user')
+            for i in range(7)
+        ])
+
+    def test_chunked_update_covers_every_row(self):
+        with CaptureQueriesContext(connection) as queries:
+            updated = chunked_update(WaitListUser.objects.all(), chunk_size=3, is_invited=True)
+        self.assertEqual(updated, 7)
+        self.assertFalse(WaitListUser.objects.filter(is_invited=False).exists())
+        self.assertEqual(sum(q['sql'].startswith('UPDATE') for q in queries.captured_queries), 3)
+
+    def test_chunked_update_respects_filter(self):
+        updated = chunked_update(WaitListUser.objects.filter(role='coach'), chunk_size=2, is_early_adopter=True)
+        self.assertEqual(updated, 3)
+        self.assertEqual(WaitListUser.objects.filter(is_early_adopter=True).count(), 3)
+
+    def admin_action(self, action, queryset):
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(admin_user)
+        response = self.client.post('/admin/waitlist/waitlistuser/', {
+            'action': action,
+            '_selected_action': list(queryset.values_list('pk', flat=True)),
+        })
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_admin_invite_action(self):
+        notices = self.admin_action('invite_users', WaitListUser.objects.filter(role='coach'))
+        self.assertEqual(notices, ['Invited 3 user(s).'])
+        self.assertEqual(WaitListUser.objects.filter(is_invited=True).count(), 3)
+
+    def test_admin_resend_sends_synchronously(self):
+        notices = self.admin_action('resend_confirmations', WaitListUser.objects.filter(role='coach'))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(notices, ['Sent confirmation emails to 3 of 3 user(s).'])
+
+    def test_admin_resend_refuses_large_selections(self):
+        with mock.patch('waitlist.admin.ADMIN_RESEND_LIMIT', 2):
+            notices = self.admin_action('resend_confirmations', WaitListUser.objects.filter(role='coach'))
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertIn('waitlist_bulk resend', notices[0])
+
+    def test_command_resends_in_batches(self):
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                        autospec=True, side_effect=lambda backend, messages: len(messages)) as send:
+            call_command('waitlist_bulk', 'resend', '--role', 'user', '--chunk-size', '2', stdout=StringIO())
+        self.assertEqual([len(call.args[1]) for call in send.call_args_list], [2, 2])
+
+    def test_command_invite(self):
+        out = StringIO()
+        call_command('waitlist_bulk', 'invite', '--role', 'user', stdout=out)
+        self.assertIn('4 of 4', out.getvalue())
+        self.assertEqual(WaitListUser.objects.filter(is_invited=True).count(), 4)
+
+
+class FakeResolver(MXResolver):
+    """Answers MX lookups from a dict instead of DNS"""
+    records = {'example.com': True, 'no-mail.example': False}
+    lookups = []
+
+    def has_mx(self, domain):
+        self.lookups.append(domain)
+        if domain not in self.records:
+            raise OSError('SERVFAIL')
+        return self.records[domain]
+
+
+class MisconfiguredResolver(MXResolver):
+    def __init__(self):
+        raise ImproperlyConfigured("missing dependency")
+
+
+@override_settings(WAITLIST_MX_CHECK=True, WAITLIST_MX_RESOLVER='waitlist.tests.FakeResolver')
+class SignupValidationTests(TestCase):
+    def setUp(self):
+        FakeResolver.lookups = []
+
+    def form(self, email):
+        return WaitlistSignupForm({'name': 'Test', 'email': email, 'role': 'user', 'source': 'other'})
+
+    def test_rejects_disposable_domains_and_subdomains(self):
+        for email in ('a@mailinator.com', 'a@MAILINATOR.com', 'a@eu.yopmail.com'):
+            form = self.form(email)
+            self.assertFalse(form.is_valid())
+            self.assertEqual(form.errors.as_data()['email'][0].code, 'disposable_email')
+        self.assertEqual(FakeResolver.lookups, [])
+
+    def test_rejects_domain_without_mx(self):
+        form = self.form('a@no-mail.example')
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors.as_data()['email'][0].code, 'no_mx')
+
+    def test_mx_results_are_cached(self):
+        for _ in range(3):
+            self.assertTrue(self.form('a@example.com').is_valid())
+        self.assertEqual(FakeResolver.lookups, ['example.com'])
+        stats = validation_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+    def test_cache_entries_expire(self):
+        with override_settings(WAITLIST_MX_CACHE_TTL=0):
+            validate_signup_email('a@example.com')
+            validate_signup_email('a@example.com')
+        self.assertEqual(FakeResolver.lookups, ['example.com', 'example.com'])
+
+    def test_lookup_failure_fails_open_and_is_not_cached(self):
+        validate_signup_email('a@flaky.example')
+        validate_signup_email('a@flaky.example')
+        self.assertEqual(FakeResolver.lookups, ['flaky.example', 'flaky.example'])
+
+    def test_cache_hit_is_sub_millisecond(self):
+        validate_signup_email('a@example.com')
+        started = time.perf_counter()
+        for _ in range(1000):
+            validate_signup_email('a@example.com')
+        self.assertLess((time.perf_counter() - started) / 1000, 0.001)
+
+    @override_settings(WAITLIST_MX_RESOLVER='waitlist.tests.MisconfiguredResolver')
+    def test_resolver_is_checked_at_startup(self):
+        with self.assertRaises(ImproperlyConfigured):
+            apps.get_app_config('waitlist').ready()
+
+    @override_settings(WAITLIST_MX_CHECK=False)
+    def test_mx_check_is_optional(self):
+        self.assertTrue(self.form('a@no-mail.example').is_valid())
+        self.assertIsNone(validation_stats())
+
+
+class PurgeWaitlistTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.old = WaitListUser.objects.create(name='Old', email='old@example.com', role='user', ip_address='10.0.0.1')
+        self.recent = WaitListUser.objects.create(name='Recent', email='recent@example.com', role='coach', ip_address='10.0.0.2')
+        self.new = WaitListUser.objects.create(name='New', email='new@example.com', role='user', ip_address='10.0.0.3')
+        WaitListUser.objects.filter(pk=self.old.pk).update(created_at=now - timedelta(days=400))
+        WaitListUser.objects.filter(pk=self.recent.pk).update(created_at=now - timedelta(days=60))
+        Session.objects.bulk_create([
+            Session(session_key=f'expired{i}', session_data='', expire_date=now - timedelta(days=1))
+            for i in range(5)
+        ] + [Session(session_key='live', session_data='', expire_date=now + timedelta(days=1))])
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command('purge_waitlist', '--batch-size', '2', *args, stdout=out)
+        return out.getvalue()
+
+    def test_archives_scrubs_and_clears_sessions(self):
+        output = self.purge('--archive-after', '365', '--ip-retention', '30')
+
+        archived = ArchivedWaitListUser.objects.get()
+        self.assertEqual((archived.original_id, archived.email), (self.old.pk, 'old@example.com'))
+        self.assertFalse(WaitListUser.objects.filter(pk=self.old.pk).exists())
+        self.assertIsNone(WaitListUser.objects.get(pk=self.recent.pk).ip_address)
+        self.assertEqual(WaitListUser.objects.get(pk=self.new.pk).ip_address, '10.0.0.3')
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+        self.assertIn('Deleted expired sessions: 5', output)
+        self.assertIn('rows/s', output)
+        self.assertIn('waitlist_waitlistuser:', output)
+
+    def test_archives_to_compressed_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive.jsonl.gz')
+            self.purge('--archive-after', '30', '--archive-file', path)
+            with gzip.open(path, 'rt') as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual(sorted(row['email'] for row in rows), ['old@example.com', 'recent@example.com'])
+        self.assertFalse(ArchivedWaitListUser.objects.exists())
+        self.assertEqual(WaitListUser.objects.count(), 1)
+        self.assertEqual(WaitListUser.count_signups(), 3)
+        self.assertEqual(WaitListUser.count_signups(role='coach'), 1)
+
+    def test_archived_rows_still_count(self):
+        WaitListUser.objects.filter(pk=self.old.pk).update(is_early_adopter=True)
+        self.purge('--archive-after', '30')
+        self.assertEqual(
+            list(ArchivedSignupCount.objects.order_by('role').values_list('role', 'is_early_adopter', 'count')),
+            [('coach', False, 1), ('user', True, 1)],
+        )
+        self.assertEqual(WaitListUser.count_signups(), 3)
+        self.assertEqual(WaitListUser.count_signups(is_early_adopter=True), 1)
+        self.assertEqual(WaitListUser.objects.get(pk=self.new.pk).waitlist_position, 3)
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_page_counts_do_not_scan_the_archive(self):
+        self.purge('--archive-after', '365')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/waitlist/')
+        self.assertEqual((response.context['total_users'], response.context['coaches']), (3, 1))
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([q for q in sql if 'waitlist_archivedwaitlistuser' in q])
+        self.assertEqual(len([q for q in sql if 'waitlist_' in q]), 2)
+
+    def test_archive_file_directory_is_created_lazily(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive', 'waitlist.jsonl.gz')
+            self.purge('--archive-after', '1000', '--archive-file', path)
+            self.assertFalse(os.path.exists(path))
+            self.purge('--archive-after', '365', '--archive-file', path)
+            with gzip.open(path, 'rt') as f:
+                self.assertEqual([json.loads(line)['email'] for line in f], ['old@example.com'])
+
+    def test_dry_run_changes_nothing(self):
+        output = self.purge('--archive-after', '365', '--dry-run')
+        self.assertIn('Would archive 1 waitlist row(s)', output)
+        self.assertEqual(WaitListUser.objects.count(), 3)
+        self.assertEqual(Session.objects.count(), 6)
+
+
+class SingleWriterTests(TestCase):
+    @override_settings(SQLITE_WRITE_QUEUE_TIMEOUT=0.05)
+    def test_nested_use_does_not_wait_on_itself(self):
+        with single_writer():
+            with single_writer():
+                pass
+            # Still held by the outer block: another thread has to wait
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                other = pool.submit(lambda: single_writer().__enter__())
+                with self.assertRaises(WriteQueueFull):
+                    other.result()
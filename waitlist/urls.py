@@ -8,4 +8,6 @@ urlpatterns = [
     path('signup/', views.waitlist_signup, name='signup'),  # Changed from early_access_signup
     path('thanks/', views.waitlist_success, name='thanks'),
     path('api/signup/', views.waitlist_api_signup, name='api_signup'),
+    path('health/db/', views.db_pool_stats, name='db_pool_stats'),
+    path('health/validation/', views.signup_validation_stats, name='signup_validation_stats'),
 ]
\ No newline at end of file
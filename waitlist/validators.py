@@ -0,0 +1,186 @@
+from pathlib import Path
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DISPOSABLE_DOMAINS_FILE = Path(__file__).resolve().parent / 'data' / 'disposable_domains.txt'
+
+
+def load_domains(path):
+    """Read a domain list (one per line, # comments) into a frozenset"""
+    with open(path, encoding='utf-8') as f:
+        return frozenset(
+            line.strip().lower()
+            for line in f
+            if line.strip() and not line.startswith('#')
+        )
+
+
+DISPOSABLE_DOMAINS = load_domains(DISPOSABLE_DOMAINS_FILE)
+
+
+def is_disposable(domain):
+    """True if domain, or any domain it is a subdomain of, is disposable"""
+    parts = domain.lower().rstrip('.').split('.')
+    return any('.'.join(parts[i:]) in DISPOSABLE_DOMAINS for i in range(len(parts) - 1))
+
+
+# ------------------------------
+# MX LOOKUPS
+# ------------------------------
+
+class MXResolver:
+    """
+    Interface for MX lookups. Subclasses answer whether a domain can receive
+    mail, and raise on lookup failures (timeouts, no nameservers) so those
+    are never cached or held against the user.
+    """
+
+    def has_mx(self, domain):
+        raise NotImplementedError
+
+
+class DNSPythonResolver(MXResolver):
+    """MX lookup through dnspython (optional dependency)"""
+
+    def __init__(self, timeout=None):
+        try:
+            import dns.resolver
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "WAITLIST_MX_CHECK needs the 'dnspython' package, or set "
+                "WAITLIST_MX_RESOLVER to another MXResolver."
+            ) from exc
+        self.dns = dns.resolver
+        self.resolver = dns.resolver.Resolver()
+        self.resolver.lifetime = settings.WAITLIST_MX_TIMEOUT if timeout is None else timeout
+
+    def has_mx(self, domain):
+        try:
+            return bool(self.resolver.resolve(domain, 'MX'))
+        except self.dns.NXDOMAIN:
+            return False
+        except self.dns.NoAnswer:
+            # No MX record: mail falls back to the domain's A record (RFC 5321)
+            try:
+                return bool(self.resolver.resolve(domain, 'A'))
+            except (self.dns.NXDOMAIN, self.dns.NoAnswer):
+                return False
+
+
+class TTLCache:
+    """Thread-safe dict with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, ttl, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                # Dicts keep insertion order, so this drops the oldest entry
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class MXChecker:
+    """Cached MX lookups through the configured MXResolver"""
+
+    def __init__(self, resolver, ttl):
+        self.resolver = resolver
+        self.cache = TTLCache(ttl)
+
+    def has_mx(self, domain):
+        cached = self.cache.get(domain)
+        if cached is not None:
+            return cached
+        try:
+            result = self.resolver.has_mx(domain)
+        except Exception as e:
+            # Fail open: a DNS hiccup shouldn't cost us a signup
+            logger.warning(f"MX lookup failed for {domain}: {str(e)}")
+            return True
+        self.cache.set(domain, result)
+        return result
+
+
+_mx_checker = None
+_mx_checker_lock = threading.Lock()
+
+
+def get_mx_checker():
+    global _mx_checker
+    if _mx_checker is None:
+        with _mx_checker_lock:
+            if _mx_checker is None:
+                resolver = import_string(settings.WAITLIST_MX_RESOLVER)()
+                _mx_checker = MXChecker(resolver, settings.WAITLIST_MX_CACHE_TTL)
+    return _mx_checker
+
+
+@receiver(setting_changed)
+def reset_mx_checker(setting, **kwargs):
+    global _mx_checker
+    if setting.startswith('WAITLIST_MX_'):
+        _mx_checker = None
+
+
+# ------------------------------
+# VALIDATION
+# ------------------------------
+
+def validate_signup_email(email):
+    """Reject disposable domains and, if WAITLIST_MX_CHECK is on, domains without MX"""
+    domain = email.rpartition('@')[2].lower()
+    if not domain:
+        return
+
+    if is_disposable(domain):
+        raise ValidationError(
+            "Please use a permanent email address, not a disposable one.",
+            code='disposable_email',
+        )
+
+    if settings.WAITLIST_MX_CHECK and not get_mx_checker().has_mx(domain):
+        raise ValidationError(
+            "This email domain can't receive mail. Please check for typos.",
+            code='no_mx',
+        )
+
+
+def validation_stats():
+    """MX cache stats for this process, or None if MX checks are off"""
+    if not settings.WAITLIST_MX_CHECK:
+        return None
+    return get_mx_checker().cache.stats()
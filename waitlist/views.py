@@ -1,19 +1,19 @@
 from threading import Thread
 from django.shortcuts import render, redirect
-from django.conf import settings
-from django.core.mail import send_mail
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.utils import IntegrityError
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import logging
 
 import json
+import os
 from .models import WaitListUser
 from .forms import WaitlistSignupForm
+from .db import single_writer, WriteQueueFull
+from .emails import send_confirmation_email
+from .validators import validation_stats
 
 logger = logging.getLogger(__name__)
 
@@ -25,27 +25,34 @@ EARLY_BIRD_LIMIT = 100
 
 def landing_page(request):
     """Main landing page with waitlist form"""
-    total_users = WaitListUser.objects.count()
-    coaches = WaitListUser.objects.filter(role='coach').count()
-    early_birds = WaitListUser.objects.filter(is_early_adopter=True).count()
+    stats = WaitListUser.signup_stats()
     
     context = {
-        'total_users': total_users,
-        'coaches': coaches,
-        'early_birds': early_birds,
-        'remaining_spots': max(0, 100 - early_birds),
+        'total_users': stats['total_users'],
+        'coaches': stats['coaches'],
+        'early_birds': stats['early_birds'],
+        'remaining_spots': max(0, 100 - stats['early_birds']),
         'form': WaitlistSignupForm(),
     }
     return render(request, 'waitlist/landing-page.html', context)
 
 
 
-def send_email_async(waitlist_user, position, is_new_user):
-    """Send email in a background thread"""
+def send_email_async(waitlist_user, position, is_new_user, total_users):
+    """
+    Send email in a background thread.
+
+    Everything the email shows is passed in from the request, so this thread
+    doesn't check out a database connection (and, when pooled, hold it for
+    the whole SMTP send).
+    """
     try:
-        send_confirmation_email(waitlist_user, position, is_new_user)
+        send_confirmation_email(waitlist_user, position, is_new_user, total_users)
     except Exception as e:
         logger.warning(f"Async email failed: {str(e)}")
+    finally:
+        # Only opens anything if the email code starts querying again
+        connection.close()
     
 
 @csrf_exempt
@@ -69,7 +76,9 @@ def waitlist_signup(request):
     source = form.cleaned_data.get('source')
 
     try:
-        with transaction.atomic():
+        with single_writer(), transaction.atomic():
+            # Only the live table is checked: someone whose row was archived by
+            # purge_waitlist signs up as new and is counted a second time.
             waitlist_user, created = WaitListUser.objects.get_or_create(
                 email=email,
                 defaults={
@@ -80,6 +89,7 @@ def waitlist_signup(request):
                 }
             )
 
+            total_users = WaitListUser.count_signups()
             if not created:
                 # Update existing user info
                 waitlist_user.name = name
@@ -88,7 +98,6 @@ def waitlist_signup(request):
                 waitlist_user.save()
             else:
                 # Early bird logic
-                total_users = WaitListUser.objects.count()
                 if total_users <= EARLY_BIRD_LIMIT:
                     waitlist_user.is_early_adopter = True
 
@@ -98,13 +107,14 @@ def waitlist_signup(request):
                 waitlist_user.ip_address = ip
                 waitlist_user.save()
 
-            # Send email asynchronously
+            # Send email asynchronously once the row is committed
             position = waitlist_user.waitlist_position
-            Thread(
+            transaction.on_commit(Thread(
                 target=send_email_async,
-                args=(waitlist_user, position, created),
+                args=(waitlist_user, position, created, total_users),
+                name='waitlist-email',
                 daemon=True
-            ).start()
+            ).start)
 
             # Save some session data for the thanks page
             request.session['waitlist_data'] = {
@@ -125,6 +135,11 @@ def waitlist_signup(request):
             'success': False,
             'error': 'This email is already on the waitlist.'
         }, status=400)
+    except WriteQueueFull:
+        return JsonResponse({
+            'success': False,
+            'error': 'We are getting a lot of signups right now. Please try again in a moment.'
+        }, status=503)
     except Exception as e:
         logger.error(f"Error in waitlist signup: {str(e)}", exc_info=True)
         return JsonResponse({
@@ -133,48 +148,6 @@ def waitlist_signup(request):
         }, status=500)
 
 
-
-
-def send_confirmation_email(waitlist_user, position=None, is_new_user=True):
-    """Send waitlist confirmation email"""
-    try:
-        subject = "Welcome to BodyForgr Waitlist!"
-        
-        # Prepare context
-        context = {
-            'user': waitlist_user,
-            'position': position if is_new_user else None,
-            'is_early_adopter': waitlist_user.is_early_adopter,
-            'total_users': WaitListUser.objects.count(),
-            'unsubscribe_link': '#',
-            'privacy_link': '#',
-        }
-        
-        # Render email content
-        html_content = render_to_string(
-            "emails/waitlist_confirmation.html",
-            context
-        )
-        text_content = strip_tags(html_content)
-        
-        # Send email
-        send_mail(
-            subject=subject,
-            message=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[waitlist_user.email],
-            html_message=html_content,
-            fail_silently=False,
-        )
-        
-        logger.info(f"Confirmation email sent to {waitlist_user.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send email to {waitlist_user.email}: {str(e)}")
-        return False
-
-
 @csrf_exempt
 def waitlist_api_signup(request):
     """Public API endpoint for external services"""
@@ -195,31 +168,34 @@ def waitlist_api_signup(request):
             }, status=400)
 
         email = form.cleaned_data['email'].lower()
-        existing_user = WaitListUser.objects.filter(email=email).first()
-
-        if existing_user:
-            existing_user.name = form.cleaned_data['name']
-            existing_user.role = form.cleaned_data['role']
-            existing_user.source = form.cleaned_data['source']
-            existing_user.save()
-            is_new = False
-            user_to_email = existing_user
-            position = existing_user.waitlist_position
-        else:
-            waitlist_user = form.save(commit=False)
-            total_users = WaitListUser.objects.count()
-            if total_users < EARLY_BIRD_LIMIT:
-                waitlist_user.is_early_adopter = True
-            waitlist_user.is_invited = True
-            waitlist_user.save()
-            is_new = True
-            user_to_email = waitlist_user
-            position = waitlist_user.waitlist_position
+        with single_writer(), transaction.atomic():
+            existing_user = WaitListUser.objects.filter(email=email).first()
+            total_users = WaitListUser.count_signups()
+
+            if existing_user:
+                existing_user.name = form.cleaned_data['name']
+                existing_user.role = form.cleaned_data['role']
+                existing_user.source = form.cleaned_data['source']
+                existing_user.save()
+                is_new = False
+                user_to_email = existing_user
+                position = existing_user.waitlist_position
+            else:
+                waitlist_user = form.save(commit=False)
+                if total_users < EARLY_BIRD_LIMIT:
+                    waitlist_user.is_early_adopter = True
+                waitlist_user.is_invited = True
+                waitlist_user.save()
+                total_users += 1
+                is_new = True
+                user_to_email = waitlist_user
+                position = waitlist_user.waitlist_position
 
         # Send email asynchronously in a separate thread
         Thread(
-            target=send_confirmation_email,
-            args=(user_to_email, position, is_new),
+            target=send_email_async,
+            args=(user_to_email, position, is_new, total_users),
+            name='waitlist-email',
             daemon=True
         ).start()
 
@@ -235,6 +211,11 @@ def waitlist_api_signup(request):
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
+    except WriteQueueFull:
+        return JsonResponse({
+            'success': False,
+            'error': 'Server busy, please retry'
+        }, status=503)
     except Exception as e:
         logger.error(f"API signup error: {str(e)}", exc_info=True)
         return JsonResponse({
@@ -260,22 +241,56 @@ def waitlist_success(request):
         del request.session['waitlist_data']
     
     # Get stats for the page
-    total_users = WaitListUser.objects.count()
-    early_birds = WaitListUser.objects.filter(is_early_adopter=True).count()
+    stats = WaitListUser.signup_stats()
     
     context = {
         'name': name,
         'email': email,
         'is_early_adopter': is_early_adopter,
         'position': position,
-        'total_users': total_users,
-        'early_birds': early_birds,
-        'remaining_spots': max(0, EARLY_BIRD_LIMIT - early_birds),
+        'total_users': stats['total_users'],
+        'early_birds': stats['early_birds'],
+        'remaining_spots': max(0, EARLY_BIRD_LIMIT - stats['early_birds']),
     }
     
     return render(request, "waitlist/thanks.html", context)
 
 
+def db_pool_stats(request):
+    """Connection pool stats for this worker process (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({
+            'success': False,
+            'error': 'Forbidden'
+        }, status=403)
+
+    pool = getattr(connection, 'pool', None)
+    return JsonResponse({
+        'success': True,
+        'pid': os.getpid(),
+        'vendor': connection.vendor,
+        'pooled': pool is not None,
+        'stats': pool.get_stats() if pool is not None else {},
+    })
+
+
+def signup_validation_stats(request):
+    """MX lookup cache hit/miss stats for this worker process (staff only)"""
+    if not request.user.is_staff:
+        return JsonResponse({
+            'success': False,
+            'error': 'Forbidden'
+        }, status=403)
+
+    stats = validation_stats()
+    return JsonResponse({
+        'success': True,
+        'pid': os.getpid(),
+        'mx_check': stats is not None,
+        'mx_cache': stats or {},
+    })
+
+
 def custom_404(request, exception):
     return render(request, 'errors/404.html', status=404)
 